@@ -4,7 +4,21 @@ from . import models
 
 class PostAdmin(admin.ModelAdmin):
     list_display = ['title', 'author', 'status', 'date_pub']
+    # change status with Post's actions only, they keep PostTag copies,
+    # Tag.posts_count and MonthArchive.posts_count up to date
+    readonly_fields = ['status', 'date_pub']
+
+
+class TagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'slug', 'posts_count']
+    prepopulated_fields = {'slug': ('name',)}
+
+
+class MonthArchiveAdmin(admin.ModelAdmin):
+    list_display = ['year', 'month', 'posts_count']
 
 
 admin.site.register(models.Post, PostAdmin)
+admin.site.register(models.Tag, TagAdmin)
 admin.site.register(models.Comment)
+admin.site.register(models.MonthArchive, MonthArchiveAdmin)
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class BlogAppConfig(AppConfig):
     name = 'blog_app'
+
+    def ready(self):
+        # connect signal receivers
+        from . import signals  # noqa: F401
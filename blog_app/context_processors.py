@@ -1,4 +1,4 @@
-from .models import Post, Comment
+from .models import Post, Comment, Tag, MonthArchive
 
 
 def recent_posts(request):
@@ -20,3 +20,25 @@ def recent_comments(request):
         .filter(post__status=Post.STATUS_PUBLISHED)\
         .order_by('-date_pub')[:5]
     return {'recent_comments': comments}
+
+
+def tag_cloud(request):
+    '''
+    Return 20 most used Tags with published Posts.
+    Uses precomputed Tag.posts_count instead of counting Posts
+    '''
+    tags = Tag.objects\
+        .filter(posts_count__gt=0)\
+        .order_by('-posts_count', 'name')[:20]
+    return {'tag_cloud': tags}
+
+
+def month_archive(request):
+    '''
+    Return 12 most recent months with published Posts.
+    Uses precomputed MonthArchive instead of aggregating Posts
+    '''
+    months = MonthArchive.objects\
+        .filter(posts_count__gt=0)\
+        .order_by('-year', '-month')[:12]
+    return {'month_archive': months}
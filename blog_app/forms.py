@@ -1 +1,31 @@
 from django import forms
+
+from .models import Post, Tag
+
+
+class PostForm(forms.ModelForm):
+    '''
+    Post's form with tags selection.
+    Tags are saved with Post.set_tags() to keep Tag.posts_count up to date.
+    '''
+    tags = forms.ModelMultipleChoiceField(
+        queryset=Tag.objects.all(),
+        widget=forms.CheckboxSelectMultiple,
+        required=False)
+
+    class Meta:
+        model = Post
+        fields = ['title', 'text']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields['tags'].initial = self.instance.tags.all()
+
+    def _save_m2m(self):
+        '''
+        Overridden to save tags, called by save()
+        or by save_m2m() after save(commit=False)
+        '''
+        super()._save_m2m()
+        self.instance.set_tags(self.cleaned_data['tags'])
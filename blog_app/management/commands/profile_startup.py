@@ -0,0 +1,101 @@
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.template import engines
+from django.urls import get_resolver
+
+from blog_app.warmup import get_template_names, resolve_named_urls
+
+
+class Command(BaseCommand):
+    help = ('Report startup overhead: import time per module, '
+            'url resolver build time and template compile time.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=20,
+            help='Number of slowest modules and templates to show.')
+
+    def handle(self, *args, **options):
+        self.limit = options['limit']
+        self.report_imports()
+        self.report_urls()
+        self.report_templates()
+
+    def report_imports(self):
+        '''
+        Run django.setup() in new interpreter with -X importtime
+        and show modules with the highest cumulative import time
+        '''
+        code = 'import django; django.setup(); import {}'.format(
+            settings.ROOT_URLCONF)
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True)
+        if result.returncode != 0:
+            raise CommandError(result.stderr)
+
+        imports = []
+        for line in result.stderr.splitlines():
+            # line format: "import time: self [us] | cumulative | package"
+            if not line.startswith('import time:'):
+                continue
+            fields = line[len('import time:'):].split('|')
+            try:
+                cumulative = int(fields[1])
+            except ValueError:
+                # header line
+                continue
+            imports.append((cumulative, int(fields[0]), fields[2].strip()))
+        imports.sort(reverse=True)
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Imports'))
+        self.stdout.write('{:>12} {:>12}  {}'.format(
+            'cumul. [ms]', 'self [ms]', 'module'))
+        for cumulative, self_time, module in imports[:self.limit]:
+            self.stdout.write('{:12.2f} {:12.2f}  {}'.format(
+                cumulative / 1000, self_time / 1000, module))
+
+    def report_urls(self):
+        '''
+        Time building url resolver and resolving all named urls
+        '''
+        start = time.perf_counter()
+        resolver = get_resolver()
+        # accessing reverse_dict populates resolver
+        resolver.reverse_dict
+        populate_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        names = resolve_named_urls()
+        resolve_time = time.perf_counter() - start
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Urls'))
+        self.stdout.write('Resolver build: {:.2f} ms'.format(
+            populate_time * 1000))
+        self.stdout.write('Reverse and resolve {} named urls: {:.2f} ms'.format(
+            len(names), resolve_time * 1000))
+
+    def report_templates(self):
+        '''
+        Time compiling each template from TEMPLATES' DIRS
+        '''
+        engine = engines['django'].engine
+        timings = []
+        for name in get_template_names():
+            source = engine.find_template(name)[0].source
+            start = time.perf_counter()
+            engine.from_string(source)
+            timings.append((time.perf_counter() - start, name))
+        timings.sort(reverse=True)
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Templates'))
+        self.stdout.write('Compile {} templates: {:.2f} ms'.format(
+            len(timings), sum(t for t, name in timings) * 1000))
+        for compile_time, name in timings[:self.limit]:
+            self.stdout.write('{:12.2f}  {}'.format(
+                compile_time * 1000, name))
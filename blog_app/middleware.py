@@ -0,0 +1,57 @@
+import cProfile
+import logging
+import os
+import random
+import re
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilingMiddleware:
+    '''
+    Profile given percentage of requests with cProfile.
+    Stats are dumped to settings.PROFILING_DIR as .prof files,
+    which can be opened with pstats, snakeviz or flameprof.
+    '''
+    # max length of request's path part of stats filename
+    PATH_MAX_LENGTH = 100
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0)
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.profiling_dir = settings.PROFILING_DIR
+        os.makedirs(self.profiling_dir, exist_ok=True)
+
+    def __call__(self, request):
+        if random.random() * 100 >= self.sample_rate:
+            return self.get_response(request)
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profile.disable()
+            path = self.get_stats_path(request)
+            try:
+                profile.dump_stats(path)
+            except OSError:
+                # profiling must never fail the request
+                logger.exception("Can't dump profiling stats to %s", path)
+        return response
+
+    def get_stats_path(self, request):
+        '''
+        Return path of stats file for given request
+        '''
+        path = re.sub(r'[^\w-]+', '.', request.path).strip('.') or 'index'
+        path = path[:self.PATH_MAX_LENGTH]
+        filename = '{:.6f}-{}-{}.prof'.format(
+            time.time(), request.method, path)
+        return os.path.join(self.profiling_dir, filename)
@@ -0,0 +1,61 @@
+# Generated by Django 2.2.28 on 2026-10-19 19:42
+
+from django.db import migrations, models
+from django.utils import timezone
+
+STATUS_PUBLISHED = 1
+
+
+def fill_month_archive(apps, schema_editor):
+    '''
+    Count already published Posts
+    '''
+    Post = apps.get_model('blog_app', 'Post')
+    MonthArchive = apps.get_model('blog_app', 'MonthArchive')
+
+    counts = {}
+    dates = Post.objects\
+        .filter(status=STATUS_PUBLISHED, date_pub__isnull=False)\
+        .values_list('date_pub', flat=True)
+    for date_pub in dates.iterator():
+        date_pub = timezone.localtime(date_pub, timezone.utc)
+        key = (date_pub.year, date_pub.month)
+        counts[key] = counts.get(key, 0) + 1
+
+    MonthArchive.objects.bulk_create([
+        MonthArchive(year=year, month=month, posts_count=count)
+        for (year, month), count in counts.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0002_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthArchive',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('posts_count', models.PositiveIntegerField(default=0, editable=False)),
+            ],
+            options={
+                'verbose_name': 'Month archive',
+                'verbose_name_plural': 'Month archives',
+                'ordering': ['-year', '-month'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', 'date_pub'], name='blog_post_status_date_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='montharchive',
+            unique_together={('year', 'month')},
+        ),
+        migrations.RunPython(fill_month_archive, migrations.RunPython.noop),
+    ]
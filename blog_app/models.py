@@ -1,4 +1,7 @@
-from django.db import models
+import datetime
+
+from django.db import models, transaction
+from django.db.models import F
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.urls import reverse, reverse_lazy
@@ -7,6 +10,25 @@ from django.core.exceptions import PermissionDenied
 UserModel = get_user_model()
 
 
+class Tag(models.Model):
+    name = models.CharField(max_length=50, unique=True)
+    slug = models.SlugField(max_length=50, unique=True)
+    # number of published Posts with this Tag,
+    # kept up to date by Post's actions, don't edit by hand
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        verbose_name = 'Tag'
+        verbose_name_plural = 'Tags'
+        ordering = ['name']
+
+    def get_absolute_url(self):
+        return reverse('tag_post_list', kwargs={'slug': self.slug})
+
+    def __str__(self):
+        return str(self.name)
+
+
 class Post(models.Model):
     # choices for Post.status field
     STATUS_DRAFT, STATUS_PUBLISHED, STATUS_ARCHIVED = range(3)
@@ -36,10 +58,19 @@ class Post(models.Model):
     date_edit = models.DateTimeField(
         verbose_name='Last edited',
         auto_now=True)
+    tags = models.ManyToManyField(
+        Tag,
+        through='PostTag',
+        related_name='posts',
+        blank=True)
 
     class Meta:
         verbose_name = 'Post'
         verbose_name_plural = 'Posts'
+        indexes = [
+            models.Index(fields=['status', 'date_pub'],
+                         name='blog_post_status_date_idx'),
+        ]
 
     def get_absolute_url(self):
         if self.status == Post.STATUS_DRAFT:
@@ -58,6 +89,94 @@ class Post(models.Model):
     def __str__(self):
         return str(self.title)
 
+    ##################
+    # Tags utilities #
+    ##################
+    def set_tags(self, tags):
+        '''
+        Replace Post's tags with given tags,
+        update Tag.posts_count if Post is published
+        '''
+        new_ids = {tag.pk for tag in tags}
+
+        with transaction.atomic():
+            # lock Post's row, so concurrent calls don't apply same diff,
+            # and read status from it, as this instance may be stale
+            status, date_pub = Post.objects\
+                .select_for_update()\
+                .values_list('status', 'date_pub')\
+                .get(pk=self.pk)
+            old_ids = set(self.post_tags.values_list('tag_id', flat=True))
+            added = new_ids - old_ids
+            removed = old_ids - new_ids
+
+            self.post_tags.filter(tag_id__in=removed).delete()
+            PostTag.objects.bulk_create([
+                PostTag(post=self, tag_id=tag_id,
+                        status=status, date_pub=date_pub)
+                for tag_id in added
+            ])
+            if status == Post.STATUS_PUBLISHED:
+                Tag.objects.filter(pk__in=added)\
+                    .update(posts_count=F('posts_count') + 1)
+                Tag.objects.filter(pk__in=removed)\
+                    .update(posts_count=F('posts_count') - 1)
+
+    def _update_tags_count(self, delta):
+        '''
+        Add delta to posts_count of all Post's tags
+        '''
+        Tag.objects.filter(post_tags__post=self)\
+            .update(posts_count=F('posts_count') + delta)
+
+    def _change_status(self, old_status, new_status, date_pub):
+        '''
+        Change Post's status from old_status to new_status,
+        copy new status and date_pub to PostTag rows,
+        update Tag.posts_count and MonthArchive.posts_count
+        '''
+        if self.status != old_status:
+            raise PermissionDenied
+
+        with transaction.atomic():
+            # update only if status wasn't changed in the meantime,
+            # so concurrent requests can't update counters twice
+            date_edit = timezone.now()
+            updated = Post.objects\
+                .filter(pk=self.pk, status=old_status)\
+                .update(status=new_status, date_pub=date_pub,
+                        date_edit=date_edit)
+            if not updated:
+                raise PermissionDenied
+            self.status = new_status
+            self.date_pub = date_pub
+            self.date_edit = date_edit
+
+            self.post_tags.update(status=self.status, date_pub=self.date_pub)
+            if self.status == Post.STATUS_PUBLISHED:
+                self._update_tags_count(1)
+                self._update_month_count(1)
+            elif old_status == Post.STATUS_PUBLISHED:
+                self._update_tags_count(-1)
+                self._update_month_count(-1)
+
+    def _update_month_count(self, delta):
+        '''
+        Add delta to posts_count of MonthArchive for Post's date_pub.
+        Months are always counted in UTC, see MonthArchive
+        '''
+        date_pub = timezone.localtime(self.date_pub, timezone.utc)
+        months = MonthArchive.objects\
+            .filter(year=date_pub.year, month=date_pub.month)
+        if delta > 0:
+            MonthArchive.objects.get_or_create(
+                year=date_pub.year, month=date_pub.month)
+        else:
+            # never go below zero, e.g. for posts published
+            # before MonthArchive was filled
+            months = months.filter(posts_count__gt=0)
+        months.update(posts_count=F('posts_count') + delta)
+
     ################################
     # Actions for post_action_view #
     ################################
@@ -66,30 +185,83 @@ class Post(models.Model):
         Set Post's status to published,
         set Post's date_pub to timezone.now()
         '''
-        if self.status != Post.STATUS_DRAFT:
-            raise PermissionDenied
-        self.status = Post.STATUS_PUBLISHED
-        self.date_pub = timezone.now()
-        self.save()
+        self._change_status(
+            Post.STATUS_DRAFT, Post.STATUS_PUBLISHED, timezone.now())
 
     def archivate(self):
         '''
         Set Post's status to archived
         '''
-        if self.status != Post.STATUS_PUBLISHED:
-            raise PermissionDenied
-        self.status = Post.STATUS_ARCHIVED
-        self.save()
+        self._change_status(
+            Post.STATUS_PUBLISHED, Post.STATUS_ARCHIVED, self.date_pub)
 
     def republish(self):
         '''
         Set Post's status to published,
         doesn't change Post's date_pub
         '''
-        if self.status != Post.STATUS_ARCHIVED:
-            raise PermissionDenied
-        self.status = Post.STATUS_PUBLISHED
-        self.save()
+        self._change_status(
+            Post.STATUS_ARCHIVED, Post.STATUS_PUBLISHED, self.date_pub)
+
+
+class PostTag(models.Model):
+    '''
+    Post-Tag relation. Post's status and date_pub are copied here,
+    so tag listings can be served by single index.
+    '''
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='post_tags')
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name='post_tags')
+
+    # copies of Post's fields, updated by Post's actions
+    status = models.PositiveSmallIntegerField(
+        choices=Post._STATUS_CHOICES,
+        default=Post.STATUS_DRAFT)
+    date_pub = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        unique_together = ('post', 'tag')
+        indexes = [
+            models.Index(fields=['tag', 'status', 'date_pub'],
+                         name='blog_posttag_listing_idx'),
+        ]
+
+    def __str__(self):
+        return str(self.post) + " - " + str(self.tag)
+
+
+class MonthArchive(models.Model):
+    '''
+    Number of published Posts in given month (in UTC),
+    kept up to date by Post's actions
+    '''
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        verbose_name = 'Month archive'
+        verbose_name_plural = 'Month archives'
+        unique_together = ('year', 'month')
+        ordering = ['-year', '-month']
+
+    def get_absolute_url(self):
+        return reverse('post_month_archive',
+                       kwargs={'year': self.year, 'month': self.month})
+
+    def get_date(self):
+        '''
+        Return first day of the month as date
+        '''
+        return datetime.date(self.year, self.month, 1)
+
+    def __str__(self):
+        return "{}-{:02d}".format(self.year, self.month)
 
 
 class Comment(models.Model):
@@ -0,0 +1,16 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from .models import Post
+
+
+@receiver(pre_delete, sender=Post)
+def post_pre_delete(sender, instance, **kwargs):
+    '''
+    Keep Tag.posts_count and MonthArchive.posts_count up to date
+    when published Post is deleted.
+    Unlike Post.delete(), runs for queryset and cascade deletes too
+    '''
+    if instance.status == Post.STATUS_PUBLISHED:
+        instance._update_tags_count(-1)
+        instance._update_month_count(-1)
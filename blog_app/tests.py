@@ -1,3 +1,422 @@
-from django.test import TestCase
+import copy
+import datetime
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.core.exceptions import PermissionDenied
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.urls import reverse, re_path
+from django.utils import timezone
+
+from . import warmup
+from .forms import PostForm
+from .models import Post, PostTag, Tag, MonthArchive
+
+UserModel = get_user_model()
+
+
+class TagsCountTest(TestCase):
+
+    def setUp(self):
+        self.user = UserModel.objects.create_user('author', password='pass')
+        self.tag_a = Tag.objects.create(name='A', slug='a')
+        self.tag_b = Tag.objects.create(name='B', slug='b')
+        self.post = Post.objects.create(
+            author=self.user, title='Post', text='Text')
+
+    def assertCounts(self, count_a, count_b):
+        self.tag_a.refresh_from_db()
+        self.tag_b.refresh_from_db()
+        self.assertEqual(
+            (self.tag_a.posts_count, self.tag_b.posts_count),
+            (count_a, count_b))
+
+    def test_set_tags_draft(self):
+        self.post.set_tags([self.tag_a, self.tag_b])
+        self.assertCounts(0, 0)
+        self.assertEqual(self.post.tags.count(), 2)
+        self.post.set_tags([self.tag_b])
+        self.assertCounts(0, 0)
+        self.assertEqual(list(self.post.tags.all()), [self.tag_b])
+
+    def test_set_tags_published(self):
+        self.post.publish()
+        self.post.set_tags([self.tag_a, self.tag_b])
+        self.assertCounts(1, 1)
+        self.post.set_tags([self.tag_b])
+        self.assertCounts(0, 1)
+        self.post.set_tags([])
+        self.assertCounts(0, 0)
+
+    def test_set_tags_copies_status(self):
+        self.post.publish()
+        self.post.set_tags([self.tag_a])
+        post_tag = PostTag.objects.get(post=self.post, tag=self.tag_a)
+        self.assertEqual(post_tag.status, Post.STATUS_PUBLISHED)
+        self.assertEqual(post_tag.date_pub, self.post.date_pub)
+
+    def test_actions(self):
+        self.post.set_tags([self.tag_a])
+        self.post.publish()
+        self.assertCounts(1, 0)
+        self.post.archivate()
+        self.assertCounts(0, 0)
+        self.assertEqual(
+            PostTag.objects.get(post=self.post).status, Post.STATUS_ARCHIVED)
+        self.post.republish()
+        self.assertCounts(1, 0)
+        self.post.delete()
+        self.assertCounts(0, 0)
+
+    def test_delete_not_published(self):
+        self.post.set_tags([self.tag_a])
+        self.post.publish()
+        self.post.archivate()
+        self.post.delete()
+        self.assertCounts(0, 0)
+
+    def test_queryset_delete(self):
+        self.post.set_tags([self.tag_a, self.tag_b])
+        self.post.publish()
+        Post.objects.filter(pk=self.post.pk).delete()
+        self.assertCounts(0, 0)
+
+    def test_stale_action(self):
+        self.post.set_tags([self.tag_a])
+        stale = Post.objects.get(pk=self.post.pk)
+        self.post.publish()
+        with self.assertRaises(PermissionDenied):
+            stale.publish()
+        self.assertCounts(1, 0)
+
+    def test_stale_set_tags(self):
+        stale = Post.objects.get(pk=self.post.pk)
+        self.post.publish()
+        stale.set_tags([self.tag_a])
+        self.assertCounts(1, 0)
+        post_tag = PostTag.objects.get(post=self.post)
+        self.assertEqual(post_tag.status, Post.STATUS_PUBLISHED)
+        self.assertEqual(post_tag.date_pub, self.post.date_pub)
+
+    def test_form_commit_false(self):
+        form = PostForm(data={
+            'title': 'Title', 'text': 'Text', 'tags': [self.tag_a.pk]})
+        self.assertTrue(form.is_valid())
+        post = form.save(commit=False)
+        post.author = self.user
+        post.save()
+        form.save_m2m()
+        self.assertEqual(list(post.tags.all()), [self.tag_a])
+
+
+class TagPostListViewTest(TestCase):
+
+    def setUp(self):
+        self.tag = Tag.objects.create(name='A', slug='a')
+        self.url = reverse('tag_post_list', kwargs={'slug': 'a'})
+
+    def create_posts(self, num):
+        posts = []
+        for i in range(num):
+            post = Post.objects.create(title=str(i), text='Text')
+            post.set_tags([self.tag])
+            post.publish()
+            posts.append(post)
+        return posts
+
+    def get_all_pages(self):
+        '''
+        Follow "before" cursors, return list of pages' posts pks
+        '''
+        pages = []
+        response = self.client.get(self.url)
+        while True:
+            pages.append([post.pk for post in response.context['posts']])
+            cursor = response.context['next_cursor']
+            if cursor is None:
+                return pages
+            response = self.client.get(self.url, {'before': cursor})
+
+    def test_pagination(self):
+        posts = self.create_posts(12)
+        pages = self.get_all_pages()
+        self.assertEqual([len(page) for page in pages], [10, 2])
+        self.assertEqual(
+            sum(pages, []), [post.pk for post in reversed(posts)])
+
+    def test_pagination_same_date_pub(self):
+        posts = self.create_posts(25)
+        date_pub = timezone.now()
+        Post.objects.update(date_pub=date_pub)
+        PostTag.objects.update(date_pub=date_pub)
+
+        pages = self.get_all_pages()
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(
+            sum(pages, []), [post.pk for post in reversed(posts)])
+
+    def test_only_published(self):
+        published, archived = self.create_posts(2)
+        archived.archivate()
+        draft = Post.objects.create(title='Draft', text='Text')
+        draft.set_tags([self.tag])
+        self.assertEqual(self.get_all_pages(), [[published.pk]])
+
+    def test_cursor_post_removed(self):
+        posts = self.create_posts(12)
+        response = self.client.get(self.url)
+        cursor = response.context['next_cursor']
+        # post the cursor points at is archived and deleted meanwhile
+        posts[2].archivate()
+        posts[2].delete()
+        response = self.client.get(self.url, {'before': cursor})
+        self.assertEqual(
+            [post.pk for post in response.context['posts']],
+            [posts[1].pk, posts[0].pk])
+
+    def test_bad_cursor(self):
+        self.create_posts(1)
+        for cursor in ['x', '999', '2019-01-01_x', '2019-13-01T00:00_1',
+                       '2019-01-01T00:00:00_1']:
+            response = self.client.get(self.url, {'before': cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+
+    def test_unknown_tag(self):
+        url = reverse('tag_post_list', kwargs={'slug': 'unknown'})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class MonthArchiveCountTest(TestCase):
+
+    def setUp(self):
+        self.post = Post.objects.create(title='Post', text='Text')
+
+    def get_count(self):
+        date_pub = timezone.localtime(self.post.date_pub, timezone.utc)
+        return MonthArchive.objects\
+            .get(year=date_pub.year, month=date_pub.month)\
+            .posts_count
+
+    def test_actions(self):
+        self.post.publish()
+        self.assertEqual(self.get_count(), 1)
+        self.post.archivate()
+        self.assertEqual(self.get_count(), 0)
+        self.post.republish()
+        self.assertEqual(self.get_count(), 1)
+        self.post.delete()
+        self.assertEqual(self.get_count(), 0)
+
+    def test_delete_not_published(self):
+        self.post.publish()
+        self.post.archivate()
+        self.post.delete()
+        self.assertEqual(self.get_count(), 0)
+
+    def test_queryset_delete(self):
+        self.post.publish()
+        Post.objects.filter(pk=self.post.pk).delete()
+        self.assertEqual(self.get_count(), 0)
+
+    def test_delete_without_month_archive(self):
+        # published without publish(), so MonthArchive wasn't updated
+        post = Post.objects.create(
+            title='Post', text='Text', status=Post.STATUS_PUBLISHED,
+            date_pub=timezone.now())
+        post.delete()
+        self.assertFalse(Post.objects.filter(pk=post.pk).exists())
+        self.assertFalse(
+            MonthArchive.objects.filter(posts_count__gt=0).exists())
+
+    @override_settings(TIME_ZONE='America/New_York')
+    def test_months_in_utc(self):
+        self.post.publish()
+        Post.objects.filter(pk=self.post.pk).update(
+            date_pub=timezone.make_aware(
+                datetime.datetime(2019, 2, 1, 1), timezone.utc))
+        self.post.refresh_from_db()
+        MonthArchive.objects.all().delete()
+        MonthArchive.objects.create(year=2019, month=2, posts_count=1)
+        self.post.archivate()
+        self.assertEqual(
+            MonthArchive.objects.get(year=2019, month=2).posts_count, 0)
+
+
+class MonthArchiveMigrationTest(TransactionTestCase):
+    migrate_from = ('blog_app', '0002_tags')
+    migrate_to = ('blog_app', '0003_montharchive')
+
+    def tearDown(self):
+        # migrate back to the latest state
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_backfill(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate([self.migrate_from])
+        apps = executor.loader.project_state([self.migrate_from]).apps
+        OldPost = apps.get_model('blog_app', 'Post')
+        dates = [
+            timezone.make_aware(datetime.datetime(2019, 3, 1)),
+            timezone.make_aware(datetime.datetime(2019, 3, 31, 23, 59)),
+            timezone.make_aware(datetime.datetime(2019, 4, 1)),
+        ]
+        for date_pub in dates:
+            OldPost.objects.create(
+                title='Post', text='Text',
+                status=Post.STATUS_PUBLISHED, date_pub=date_pub)
+        OldPost.objects.create(
+            title='Archived', text='Text',
+            status=Post.STATUS_ARCHIVED, date_pub=dates[0])
+        OldPost.objects.create(title='Draft', text='Text')
+
+        executor = MigrationExecutor(connection)
+        executor.migrate([self.migrate_to])
+        apps = executor.loader.project_state([self.migrate_to]).apps
+        NewMonthArchive = apps.get_model('blog_app', 'MonthArchive')
+        counts = NewMonthArchive.objects\
+            .order_by('year', 'month')\
+            .values_list('year', 'month', 'posts_count')
+        self.assertEqual(list(counts), [(2019, 3, 2), (2019, 4, 1)])
+
+
+class PostDateArchiveViewTest(TestCase):
+
+    def create_post(self, date_pub, status=Post.STATUS_PUBLISHED):
+        return Post.objects.create(
+            title='Post', text='Text', status=status,
+            date_pub=timezone.make_aware(date_pub))
+
+    def get_posts(self, **kwargs):
+        if 'month' in kwargs:
+            url = reverse('post_month_archive', kwargs=kwargs)
+        else:
+            url = reverse('post_year_archive', kwargs=kwargs)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [post.pk for post in response.context['posts']]
+
+    def test_december_january_boundary(self):
+        december = self.create_post(datetime.datetime(2018, 12, 31, 23, 59))
+        january = self.create_post(datetime.datetime(2019, 1, 1))
+        self.assertEqual(self.get_posts(year=2018, month=12), [december.pk])
+        self.assertEqual(self.get_posts(year=2019, month=1), [january.pk])
+        self.assertEqual(self.get_posts(year=2018), [december.pk])
+        self.assertEqual(self.get_posts(year=2019), [january.pk])
+
+    def test_only_published(self):
+        published = self.create_post(datetime.datetime(2019, 5, 1))
+        self.create_post(datetime.datetime(2019, 5, 2), Post.STATUS_ARCHIVED)
+        self.create_post(datetime.datetime(2019, 5, 3), Post.STATUS_DRAFT)
+        self.assertEqual(self.get_posts(year=2019, month=5), [published.pk])
+        self.assertEqual(self.get_posts(year=2019), [published.pk])
+
+    def test_wrong_month(self):
+        url = reverse('post_month_archive', kwargs={'year': 2019, 'month': 13})
+        self.assertEqual(self.client.get(url).status_code, 404)
+        url = reverse('post_month_archive', kwargs={'year': 2019, 'month': 0})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_months_on_year_page_only(self):
+        post = Post.objects.create(title='Post', text='Text')
+        post.publish()
+        date_pub = timezone.localtime(post.date_pub)
+        response = self.client.get(reverse(
+            'post_year_archive', kwargs={'year': date_pub.year}))
+        self.assertEqual(
+            [month.month for month in response.context['months']],
+            [date_pub.month])
+        response = self.client.get(reverse(
+            'post_month_archive',
+            kwargs={'year': date_pub.year, 'month': date_pub.month}))
+        self.assertNotIn('months', response.context)
+
+
+class WarmupTest(TestCase):
+
+    def test_precompile_templates(self):
+        templates = copy.deepcopy(settings.TEMPLATES)
+        templates[0]['OPTIONS']['loaders'] = [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ]
+        with override_settings(TEMPLATES=templates):
+            names = warmup.precompile_templates()
+        self.assertIn('base.html', names)
+        self.assertIn('blog_app/index.html', names)
+
+    def test_precompile_templates_not_cached(self):
+        templates = copy.deepcopy(settings.TEMPLATES)
+        templates[0]['OPTIONS']['loaders'] = [
+            'django.template.loaders.filesystem.Loader',
+        ]
+        with override_settings(TEMPLATES=templates):
+            self.assertEqual(warmup.precompile_templates(), [])
+
+    def test_resolve_named_urls(self):
+        names = warmup.resolve_named_urls()
+        self.assertIn('index', names)
+        self.assertIn('post_month_archive', names)
+
+    def test_resolve_named_urls_not_reversible(self):
+        patterns = [
+            re_path(r'^regex/(?P<code>[A-Z]{3})/$', lambda r: None,
+                    name='regex'),
+        ]
+        with mock.patch('blog_app.urls.urlpatterns', patterns):
+            with self.assertLogs('blog_app.warmup', 'WARNING'):
+                self.assertEqual(warmup.resolve_named_urls(), [])
+
+
+class ProfilingMiddlewareTest(TestCase):
+
+    def setUp(self):
+        self.profiling_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profiling_dir)
+
+    def get(self, path, sample_rate):
+        with override_settings(PROFILING_SAMPLE_RATE=sample_rate,
+                               PROFILING_DIR=self.profiling_dir):
+            return self.client.get(path)
+
+    def test_disabled(self):
+        self.assertEqual(self.get('/', 0).status_code, 200)
+        self.assertEqual(os.listdir(self.profiling_dir), [])
+
+    def test_all_requests(self):
+        self.assertEqual(self.get('/', 100).status_code, 200)
+        self.assertEqual(self.get('/', 100).status_code, 200)
+        files = os.listdir(self.profiling_dir)
+        self.assertEqual(len(files), 2)
+        self.assertTrue(all(name.endswith('.prof') for name in files))
+
+    def test_long_path(self):
+        self.assertEqual(self.get('/' + 'x' * 300, 100).status_code, 404)
+        self.assertEqual(len(os.listdir(self.profiling_dir)), 1)
+
+    def test_dump_error(self):
+        with mock.patch('cProfile.Profile.dump_stats', side_effect=OSError):
+            with self.assertLogs('blog_app.middleware', 'ERROR'):
+                response = self.get('/', 100)
+        self.assertEqual(response.status_code, 200)
+
+
+class ProfileStartupCommandTest(TestCase):
+
+    def test_command(self):
+        out = StringIO()
+        call_command('profile_startup', limit=3, stdout=out)
+        output = out.getvalue()
+        self.assertIn('Imports', output)
+        self.assertIn('Resolver build', output)
+        self.assertRegex(output, r'Compile \d+ templates')
@@ -15,6 +15,15 @@ urlpatterns = [
     path('post/<int:post_pk>/comment',
          views.public.CommentAddView.as_view(),
          name='comment_add'),
+    path('tag/<slug:slug>/',
+         views.public.TagPostListView.as_view(),
+         name='tag_post_list'),
+    path('posts/<int:year>/',
+         views.archive.PostYearArchiveView.as_view(),
+         name='post_year_archive'),
+    path('posts/<int:year>/<int:month>/',
+         views.archive.PostMonthArchiveView.as_view(),
+         name='post_month_archive'),
     #################################
     # Urls requiring authentication #
     #################################
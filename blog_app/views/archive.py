@@ -1,3 +1,5 @@
+import datetime
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.generic import ListView, DetailView
 from django.views.generic.detail import SingleObjectTemplateResponseMixin
@@ -10,8 +12,9 @@ from django.contrib.messages.views import SuccessMessageMixin
 from django.http import Http404, HttpResponseForbidden
 from django.urls import reverse, reverse_lazy
 from django.core.exceptions import PermissionDenied
+from django.db.models import Count
 
-from blog_app.models import Post, Comment
+from blog_app.models import Post, Comment, MonthArchive
 
 
 class ArchiveListView(LoginRequiredMixin, ListView):
@@ -31,6 +34,93 @@ class ArchiveListView(LoginRequiredMixin, ListView):
         return queryset
 
 
+class BasePostDateArchiveView(ListView):
+    '''
+    Base view for published posts from given period.
+    Subclasses have to implement get_date_range()
+    '''
+    model = Post
+    context_object_name = 'posts'
+    paginate_by = 10
+    template_name = 'blog_app/post_date_archive.html'
+
+    def get_date_range(self):
+        '''
+        Return (start, end) datetimes of selected period,
+        in UTC to match MonthArchive
+        '''
+        raise NotImplementedError
+
+    def get_queryset(self):
+        start, end = self.get_date_range()
+        queryset = super().get_queryset()
+        # filter by date_pub range to use Post's (status, date_pub) index
+        queryset = queryset\
+            .filter(status=Post.STATUS_PUBLISHED,
+                    date_pub__gte=start,
+                    date_pub__lt=end)\
+            .select_related('author')\
+            .prefetch_related('tags')\
+            .order_by('-date_pub')\
+            .annotate(comments_num=Count('comments'))
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        '''
+        Add selected period's start to templates context
+        '''
+        context = super().get_context_data(**kwargs)
+        # as date, so template doesn't convert it from UTC
+        context['period_start'] = self.get_date_range()[0].date()
+        return context
+
+
+class PostYearArchiveView(BasePostDateArchiveView):
+    '''
+    Show published posts from given year
+    '''
+
+    def get_date_range(self):
+        year = self.kwargs['year']
+        if not 1 <= year < 9999:
+            raise Http404
+        start = timezone.make_aware(
+            datetime.datetime(year, 1, 1), timezone.utc)
+        end = timezone.make_aware(
+            datetime.datetime(year + 1, 1, 1), timezone.utc)
+        return start, end
+
+    def get_context_data(self, **kwargs):
+        '''
+        Add year's months to templates context
+        '''
+        context = super().get_context_data(**kwargs)
+        context['months'] = MonthArchive.objects.filter(
+            year=self.kwargs['year'], posts_count__gt=0)
+        return context
+
+
+class PostMonthArchiveView(BasePostDateArchiveView):
+    '''
+    Show published posts from given month
+    '''
+
+    def get_date_range(self):
+        year = self.kwargs['year']
+        month = self.kwargs['month']
+        if not (1 <= year < 9999 and 1 <= month <= 12):
+            raise Http404
+        start = timezone.make_aware(
+            datetime.datetime(year, month, 1), timezone.utc)
+        if month == 12:
+            year, month = year + 1, 1
+        else:
+            month += 1
+        end = timezone.make_aware(
+            datetime.datetime(year, month, 1), timezone.utc)
+        return start, end
+
+
 class ArchiveDetailView(DetailView):
     model = Post
     context_object_name = 'post'
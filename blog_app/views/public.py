@@ -10,9 +10,10 @@ from django.contrib.messages.views import SuccessMessageMixin
 from django.http import Http404, HttpResponseForbidden
 from django.urls import reverse, reverse_lazy
 from django.core.exceptions import PermissionDenied
-from django.db.models import Count
+from django.db.models import Count, Q
+from django.utils.dateparse import parse_datetime
 
-from blog_app.models import Post, Comment
+from blog_app.models import Post, Comment, Tag
 
 
 class IndexView(ListView):
@@ -32,11 +33,104 @@ class IndexView(ListView):
         queryset = queryset\
             .filter(status=Post.STATUS_PUBLISHED)\
             .select_related('author')\
+            .prefetch_related('tags')\
             .order_by('-date_pub')\
             .annotate(comments_num=Count('comments'))
         return queryset
 
 
+class TagPostListView(ListView):
+    '''
+    Show published posts with given tag.
+    Uses keyset pagination: next page starts after (date_pub, pk) given
+    in "before" GET parameter, so no OFFSET or COUNT queries are needed.
+    '''
+    model = Post
+    template_name = 'blog_app/tag_post_list.html'
+    context_object_name = 'posts'
+    # number of posts on a single page
+    page_size = 10
+
+    def dispatch(self, request, *args, **kwargs):
+        '''
+        Overridden to check if selected tag exists
+        '''
+        self.tag = get_object_or_404(Tag, slug=kwargs['slug'])
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_queryset(self):
+        # filter and order by PostTag's copies of status and date_pub,
+        # served by PostTag's (tag, status, date_pub) index
+        conditions = Q(post_tags__tag=self.tag,
+                       post_tags__status=Post.STATUS_PUBLISHED)
+
+        before = self.request.GET.get('before')
+        if before is not None:
+            cursor_date, cursor_pk = self.parse_cursor(before)
+            conditions &= \
+                Q(post_tags__date_pub__lt=cursor_date) | \
+                Q(post_tags__date_pub=cursor_date, pk__lt=cursor_pk)
+
+        # conditions on post_tags must be in single filter() call,
+        # otherwise each call joins PostTag table again
+        queryset = super().get_queryset()
+        queryset = queryset\
+            .filter(conditions)\
+            .select_related('author')\
+            .prefetch_related('tags')\
+            .order_by('-post_tags__date_pub', '-pk')
+
+        # fetch one more post to check if there is a next page
+        posts = list(queryset[:self.page_size + 1])
+        self.has_next = len(posts) > self.page_size
+        posts = posts[:self.page_size]
+
+        # count comments for displayed posts only
+        comments_num = dict(
+            Comment.objects
+            .filter(post__in=posts)
+            .values_list('post')
+            .annotate(num=Count('pk'))
+            .order_by())
+        for post in posts:
+            post.comments_num = comments_num.get(post.pk, 0)
+        return posts
+
+    def get_context_data(self, **kwargs):
+        '''
+        Add selected tag and next page's cursor to templates context
+        '''
+        context = super().get_context_data(**kwargs)
+        context['tag'] = self.tag
+        context['next_cursor'] = None
+        if self.has_next:
+            context['next_cursor'] = self.make_cursor(context['posts'][-1])
+        return context
+
+    @staticmethod
+    def make_cursor(post):
+        '''
+        Return cursor pointing after given post: "<date_pub iso>_<pk>"
+        '''
+        return '{}_{}'.format(post.date_pub.isoformat(), post.pk)
+
+    @staticmethod
+    def parse_cursor(cursor):
+        '''
+        Return (date_pub, pk) from cursor made by make_cursor(),
+        raise Http404 if cursor is malformed
+        '''
+        date_pub, _, pk = cursor.rpartition('_')
+        try:
+            date_pub = parse_datetime(date_pub)
+        except ValueError:
+            date_pub = None
+        if date_pub is None or timezone.is_naive(date_pub) \
+                or not pk.isdigit():
+            raise Http404
+        return date_pub, int(pk)
+
+
 class PostDetailView(DetailView):
     model = Post
     context_object_name = 'post'
@@ -48,7 +142,7 @@ class PostDetailView(DetailView):
         queryset = queryset\
             .filter(status=Post.STATUS_PUBLISHED)\
             .select_related('author')\
-            .prefetch_related('comments')
+            .prefetch_related('comments', 'tags')
         return queryset
 
 
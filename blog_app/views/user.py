@@ -12,11 +12,12 @@ from django.urls import reverse, reverse_lazy
 from django.core.exceptions import PermissionDenied
 
 from blog_app.models import Post, Comment
+from blog_app.forms import PostForm
 
 
 class PostCreateDraftView(SuccessMessageMixin, LoginRequiredMixin, CreateView):
     model = Post
-    fields = ['title', 'text']
+    form_class = PostForm
     success_message = "Draft created successfully!"
 
     def form_valid(self, form):
@@ -61,7 +62,7 @@ class UserPostList(LoginRequiredMixin, ListView):
 
 class PostUpdateView(SuccessMessageMixin, UserPassesTestMixin, UpdateView):
     model = Post
-    fields = ['title', 'text']
+    form_class = PostForm
     success_message = "Post updated successfully!"
 
     def test_func(self):
@@ -0,0 +1,86 @@
+import logging
+import os
+
+from django.template import engines
+from django.template.loaders.cached import Loader as CachedLoader
+from django.urls import reverse, resolve, NoReverseMatch, Resolver404
+from django.urls.converters import IntConverter
+
+logger = logging.getLogger(__name__)
+
+
+def get_template_names():
+    '''
+    Return names of all templates in TEMPLATES' DIRS
+    '''
+    names = []
+    for directory in engines['django'].engine.dirs:
+        for root, dirs, files in os.walk(directory):
+            for filename in files:
+                if not filename.endswith('.html'):
+                    continue
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, directory)
+                names.append(name.replace(os.sep, '/'))
+    return sorted(names)
+
+
+def precompile_templates():
+    '''
+    Load all templates, so cached loader stores compiled templates
+    before first request. Return list of loaded template names.
+    Does nothing if cached loader isn't used (e.g. with DEBUG on).
+    '''
+    engine = engines['django']
+    if not any(isinstance(loader, CachedLoader)
+               for loader in engine.engine.template_loaders):
+        return []
+    names = get_template_names()
+    for name in names:
+        engine.get_template(name)
+    return names
+
+
+def get_url_kwargs(pattern):
+    '''
+    Return sample kwargs matching pattern's path converters
+    '''
+    kwargs = {}
+    for name, converter in pattern.pattern.converters.items():
+        if isinstance(converter, IntConverter):
+            kwargs[name] = 1
+        else:
+            kwargs[name] = 'x'
+    return kwargs
+
+
+def resolve_named_urls():
+    '''
+    Reverse and resolve every named url of blog_app,
+    so url resolver's caches are populated before first request.
+    Return list of resolved url names.
+    Urls which can't be reversed with sample kwargs are logged and skipped.
+    '''
+    from blog_app.urls import urlpatterns
+
+    names = []
+    for pattern in urlpatterns:
+        if not pattern.name:
+            continue
+        try:
+            url = reverse(pattern.name, kwargs=get_url_kwargs(pattern))
+            resolve(url)
+        except (NoReverseMatch, Resolver404):
+            logger.warning("Can't warm up url %r", pattern.name,
+                           exc_info=True)
+            continue
+        names.append(pattern.name)
+    return names
+
+
+def warm_up():
+    '''
+    Precompile templates and resolve named urls
+    '''
+    precompile_templates()
+    resolve_named_urls()
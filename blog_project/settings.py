@@ -41,6 +41,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'blog_app.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -52,14 +53,25 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'blog_project.urls'
 
+_TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if not DEBUG:
+    # templates are compiled once per process,
+    # see blog_app.warmup for precompiling them at startup
+    _TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', _TEMPLATE_LOADERS),
+    ]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [
             os.path.join(BASE_DIR, 'templates'),
         ],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': _TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -67,6 +79,8 @@ TEMPLATES = [
                 'django.contrib.messages.context_processors.messages',
                 'blog_app.context_processors.recent_posts',
                 'blog_app.context_processors.recent_comments',
+                'blog_app.context_processors.tag_cloud',
+                'blog_app.context_processors.month_archive',
             ],
         },
     },
@@ -132,3 +146,10 @@ STATICFILES_DIRS = [
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'index'
 LOGOUT_REDIRECT_URL = 'index'
+
+
+# Profiling
+# Percentage of requests profiled by blog_app.middleware.ProfilingMiddleware,
+# 0 disables the middleware
+PROFILING_SAMPLE_RATE = 0
+PROFILING_DIR = os.path.join(BASE_DIR, 'profiles')
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_project.settings')
 
 application = get_wsgi_application()
+
+# precompile templates and populate url resolver before first request
+from blog_app.warmup import warm_up  # noqa: E402
+warm_up()